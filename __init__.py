@@ -3,8 +3,11 @@
 # Adds draggable in/out frame handles as overlays in animation editors
 
 import bpy
+import blf
 import gpu
 import math
+import numpy as np
+from bpy.app.handlers import persistent
 from gpu_extras.batch import batch_for_shader
 
 
@@ -13,25 +16,52 @@ from gpu_extras.batch import batch_for_shader
 # -----------------------------------------------------------------------------
 
 class TimelineWidgetState:
-    """Stores the state for the timeline widget overlay"""
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.draw_handlers = {}
-            # Frame range handles
-            cls._instance.is_dragging_in = False
-            cls._instance.is_dragging_out = False
-            cls._instance.hover_in = False
-            cls._instance.hover_out = False
-            # Preview range handles
-            cls._instance.is_dragging_preview_in = False
-            cls._instance.is_dragging_preview_out = False
-            cls._instance.hover_preview_in = False
-            cls._instance.hover_preview_out = False
-            cls._instance.enabled = True
-        return cls._instance
+    """Stores the state for the timeline widget overlay (one module-level instance)"""
+    # Hot attributes are read on every redraw and mouse move; slots avoid
+    # the per-instance __dict__ lookup
+    __slots__ = (
+        'draw_handlers',
+        'is_dragging_in', 'is_dragging_out', 'hover_in', 'hover_out',
+        'is_dragging_preview_in', 'is_dragging_preview_out',
+        'hover_preview_in', 'hover_preview_out',
+        'drag_frame', 'enabled',
+        'handle_meshes', 'shaders', 'vert_format', 'label_cache',
+        'gpu_blend', 'bound_shader', 'font_size',
+        'region_batches', 'region_handle_xs',
+    )
+    
+    def __init__(self):
+        self.draw_handlers = {}
+        # Frame range handles
+        self.is_dragging_in = False
+        self.is_dragging_out = False
+        self.hover_in = False
+        self.hover_out = False
+        # Preview range handles
+        self.is_dragging_preview_in = False
+        self.is_dragging_preview_out = False
+        self.hover_preview_in = False
+        self.hover_preview_out = False
+        # Frame under the mouse while dragging, committed on release
+        self.drag_frame = None
+        self.enabled = True
+        # Local-space handle meshes keyed by region height and settings
+        self.handle_meshes = {}
+        # Builtin shaders, fetched lazily once a GPU context exists
+        self.shaders = {}
+        self.vert_format = None
+        # GPU and font state last set by this add-on within the current callback
+        self.gpu_blend = None
+        self.bound_shader = None
+        self.font_size = None
+        # (width, height, background mesh) of label texts keyed by digit pattern
+        self.label_cache = {}
+        # (draw key, (triangles, lines) batches) keyed by region pointer, so
+        # editors shown side by side don't rebuild each other's batches
+        self.region_batches = {}
+        # (in, out, preview in, preview out) region x of the handles as last
+        # drawn, keyed by region pointer; lets hover checks skip View2D
+        self.region_handle_xs = {}
 
 
 state = TimelineWidgetState()
@@ -46,20 +76,18 @@ def get_prefs():
     return bpy.context.preferences.addons[__package__].preferences
 
 
-def get_editor_settings(context):
-    """Get settings for the current editor, with per-editor override support"""
-    prefs = get_prefs()
-    
-    # Map space types to editor settings
-    space_type = context.area.type if context.area else None
-    editor_map = {
-        'DOPESHEET_EDITOR': 'dopesheet',
-        'GRAPH_EDITOR': 'graph_editor',
-        'NLA_EDITOR': 'nla_editor',
-        'SEQUENCE_EDITOR': 'sequencer',
-    }
-    
-    editor_key = editor_map.get(space_type)
+# Per-editor settings group used by each animation space
+SPACE_SETTINGS_KEYS = {
+    'SpaceDopeSheetEditor': 'dopesheet',
+    'SpaceGraphEditor': 'graph_editor',
+    'SpaceNLA': 'nla_editor',
+    'SpaceSequenceEditor': 'sequencer',
+}
+
+
+def get_editor_settings(prefs, space_name):
+    """Get settings for an editor space, with per-editor override support"""
+    editor_key = SPACE_SETTINGS_KEYS.get(space_name)
     
     if editor_key and prefs.use_per_editor_settings:
         editor_settings = getattr(prefs, editor_key)
@@ -349,12 +377,9 @@ class TimelineIOPreferences(bpy.types.AddonPreferences):
 # Coordinate Conversion Functions
 # -----------------------------------------------------------------------------
 
-def frame_to_region_x(context, frame):
-    """Convert a frame number to region x coordinate using View2D."""
-    region = context.region
-    view2d = region.view2d
-    x, _ = view2d.view_to_region(float(frame), 0.0, clip=False)
-    return x
+def round_frame(frame):
+    """Round a view-space frame to the nearest whole frame (halves away from zero)"""
+    return int(frame + 0.5) if frame >= 0 else -int(0.5 - frame)
 
 
 def region_x_to_frame(context, x):
@@ -362,7 +387,54 @@ def region_x_to_frame(context, x):
     region = context.region
     view2d = region.view2d
     frame, _ = view2d.region_to_view(float(x), 0.0)
-    return int(round(frame))
+    return round_frame(frame)
+
+
+def get_view_mapping(region):
+    """
+    Get (offset, scale) such that region x = offset + scale * frame.
+    View2D is affine, so sampling it once per redraw replaces a View2D
+    call per converted frame.
+    """
+    view2d = region.view2d
+    width = float(region.width)
+    f0 = view2d.region_to_view(0.0, 0.0)[0]
+    f1 = view2d.region_to_view(width, 0.0)[0]
+    if f1 == f0:
+        return 0.0, 0.0
+    scale = width / (f1 - f0)
+    return -f0 * scale, scale
+
+
+def range_to_region_x(view_mapping, start, end):
+    """Convert a frame range to whole-pixel region x coordinates"""
+    offset, scale = view_mapping
+    return round(offset + scale * start), round(offset + scale * end)
+
+
+def get_display_frames(scene):
+    """
+    Get (frame_start, frame_end, preview_start, preview_end) as they should
+    be displayed, with an in-progress drag applied over the scene values.
+    """
+    frame_start = scene.frame_start
+    frame_end = scene.frame_end
+    preview_start = scene.frame_preview_start
+    preview_end = scene.frame_preview_end
+    
+    st = state
+    drag_frame = st.drag_frame
+    if drag_frame is not None:
+        if st.is_dragging_in:
+            frame_start = drag_frame
+        elif st.is_dragging_out:
+            frame_end = drag_frame
+        elif st.is_dragging_preview_in:
+            preview_start = drag_frame
+        elif st.is_dragging_preview_out:
+            preview_end = drag_frame
+    
+    return frame_start, frame_end, preview_start, preview_end
 
 
 # -----------------------------------------------------------------------------
@@ -373,101 +445,241 @@ HEADER_HEIGHT = 18  # Height of timeline header (constant)
 CORNER_RADIUS = 4   # Fixed corner radius matching Blender UI style
 
 
-def draw_rect(shader, x, y, width, height, color):
-    """Draw a filled rectangle"""
-    vertices = [
+class ShapeMesh:
+    """Single-colored triangle mesh built in local (region) coordinates"""
+
+    def __init__(self):
+        self.verts = []
+        self.indices = []
+        self.vert_count = 0
+
+    def add(self, verts, indices):
+        """Add a float32 vertex block with indices relative to its first vertex"""
+        self.verts.append(verts)
+        self.indices.append(indices + self.vert_count)
+        self.vert_count += len(verts)
+
+    def freeze(self):
+        """Return the mesh as (verts, indices) float32/int32 arrays"""
+        return np.concatenate(self.verts), np.concatenate(self.indices)
+
+
+def reset_gpu_state_cache():
+    """Forget tracked GPU and font state; Blender may change it between draw callbacks"""
+    state.gpu_blend = None
+    state.bound_shader = None
+    state.font_size = None
+
+
+def set_blend(mode):
+    """Set the GPU blend mode, skipping the call when it is already active"""
+    if state.gpu_blend != mode:
+        gpu.state.blend_set(mode)
+        state.gpu_blend = mode
+
+
+def set_font_size(size):
+    """Set the default font size, skipping the call when it is already set"""
+    if state.font_size != size:
+        blf.size(0, size)
+        state.font_size = size
+
+
+def bind_shader(shader):
+    """Bind a shader, skipping the call when it is already bound"""
+    if state.bound_shader is not shader:
+        shader.bind()
+        state.bound_shader = shader
+
+
+def get_widget_vert_format():
+    """
+    Vertex format of the widget triangles: float32 positions and RGBA8
+    colors, normalized back to 0..1 when fetched by the shader.
+    """
+    if state.vert_format is None:
+        fmt = gpu.types.GPUVertFormat()
+        fmt.attr_add(id="pos", comp_type='F32', len=2, fetch_mode='FLOAT')
+        fmt.attr_add(id="color", comp_type='U8', len=4, fetch_mode='INT_TO_FLOAT_UNIT')
+        state.vert_format = fmt
+    return state.vert_format
+
+
+def quantize_color(color):
+    """Convert an RGBA float color to RGBA8"""
+    return (np.asarray(color, dtype=np.float32) * 255.0 + 0.5).astype(np.uint8)
+
+
+class WidgetGeometry:
+    """Accumulates colored meshes and lines so the overlay is drawn in two batches"""
+
+    def __init__(self):
+        self.verts = []
+        self.colors = []
+        self.indices = []
+        self.vert_count = 0
+        self.line_verts = []
+        self.line_colors = []
+
+    def add(self, mesh, color, offset_x=0.0, offset_y=0.0):
+        """Add a frozen mesh, translated by (offset_x, offset_y)"""
+        verts, indices = mesh
+        if offset_x or offset_y:
+            verts = verts + np.array((offset_x, offset_y), dtype=np.float32)
+        count = len(verts)
+        self.verts.append(verts)
+        self.colors.append(np.broadcast_to(quantize_color(color), (count, 4)))
+        self.indices.append(indices + self.vert_count)
+        self.vert_count += count
+
+    def add_vertical_line(self, x, y_bottom, y_top, color):
+        """Add a vertical line segment, drawn with the polyline shader"""
+        self.line_verts.extend(((x, y_bottom), (x, y_top)))
+        self.line_colors.extend((color, color))
+
+    def build_batches(self, shader, line_shader):
+        """Build the (triangles, lines) batches, None for an empty one"""
+        tri_batch = None
+        if self.vert_count:
+            vbo = gpu.types.GPUVertBuf(get_widget_vert_format(), self.vert_count)
+            vbo.attr_fill("pos", np.concatenate(self.verts))
+            # Concatenating broadcast views can yield a Fortran-ordered array,
+            # while attr_fill reads whole vertices at strides[0]
+            vbo.attr_fill("color", np.ascontiguousarray(np.concatenate(self.colors)))
+            ibo = gpu.types.GPUIndexBuf(type='TRIS', seq=np.concatenate(self.indices))
+            tri_batch = gpu.types.GPUBatch(type='TRIS', buf=vbo, elem=ibo)
+        line_batch = None
+        if self.line_verts:
+            line_batch = batch_for_shader(line_shader, 'LINES',
+                                          {"pos": self.line_verts,
+                                           "color": self.line_colors})
+        return tri_batch, line_batch
+
+
+RECT_INDICES = np.array(((0, 1, 2), (0, 2, 3)), dtype=np.int32)
+
+# Triangulation of the 8 vertex square-cornered bracket outline
+BRACKET_INDICES = np.array(((0, 1, 2), (0, 2, 3), (0, 3, 4),
+                            (0, 4, 7), (7, 4, 5), (7, 5, 6)), dtype=np.int32)
+
+# Rounded rect templates keyed by segment count
+_rounded_rect_templates = {}
+
+
+def get_rounded_rect_template(segments):
+    """
+    Get unit-circle corner offsets, corner sides and fan indices for a
+    rounded rectangle. Corners go bottom-left, bottom-right, top-right,
+    top-left; a side of 0/1 selects the low/high corner center on each axis.
+    """
+    template = _rounded_rect_templates.get(segments)
+    if template is None:
+        t = np.linspace(0.0, 0.5 * math.pi, segments + 1)
+        starts = np.array((math.pi, 1.5 * math.pi, 0.0, 0.5 * math.pi))
+        angles = (starts[:, None] + t[None, :]).ravel()
+        offsets = np.stack((np.cos(angles), np.sin(angles)), axis=1).astype(np.float32)
+        
+        sides = np.repeat(np.array(((0, 0), (1, 0), (1, 1), (0, 1)), dtype=np.float32),
+                          segments + 1, axis=0)
+        
+        # Triangle fan around the center vertex (index 0)
+        num_verts = len(angles) + 1
+        fan = [(0, i, i + 1) for i in range(1, num_verts - 1)]
+        fan.append((0, num_verts - 1, 1))
+        
+        template = (offsets, sides, np.array(fan, dtype=np.int32))
+        _rounded_rect_templates[segments] = template
+    return template
+
+
+def rect_mesh(x, y, width, height):
+    """Build (verts, indices) for a filled rectangle"""
+    verts = np.array((
         (x, y),
         (x + width, y),
         (x + width, y + height),
         (x, y + height),
-    ]
-    indices = [(0, 1, 2), (0, 2, 3)]
-    
-    batch = batch_for_shader(shader, 'TRIS', {"pos": vertices}, indices=indices)
-    shader.uniform_float("color", color)
-    batch.draw(shader)
+    ), dtype=np.float32)
+    return verts, RECT_INDICES
 
 
-def draw_rounded_rect(shader, x, y, width, height, color, radius=CORNER_RADIUS, segments=4):
-    """Draw a filled rectangle with rounded corners (Blender UI style)"""
+def rounded_rect_mesh(x, y, width, height, radius=CORNER_RADIUS, segments=4):
+    """Build (verts, indices) for a rectangle with rounded corners (Blender UI style)"""
     # Clamp radius to fit
     radius = min(radius, width / 2, height / 2)
     
     if radius <= 1:
-        draw_rect(shader, x, y, width, height, color)
-        return
-    
-    vertices = []
-    
-    # Generate corner arcs
-    corners = [
-        (x + radius, y + radius, math.pi, 1.5 * math.pi),           # bottom-left
-        (x + width - radius, y + radius, 1.5 * math.pi, 2 * math.pi),  # bottom-right
-        (x + width - radius, y + height - radius, 0, 0.5 * math.pi),   # top-right
-        (x + radius, y + height - radius, 0.5 * math.pi, math.pi),     # top-left
-    ]
+        return rect_mesh(x, y, width, height)
     
-    for cx, cy, start_angle, end_angle in corners:
-        for i in range(segments + 1):
-            t = i / segments
-            angle = start_angle + t * (end_angle - start_angle)
-            vx = cx + radius * math.cos(angle)
-            vy = cy + radius * math.sin(angle)
-            vertices.append((vx, vy))
+    offsets, sides, fan = get_rounded_rect_template(segments)
     
-    # Triangle fan from center
-    center = (x + width / 2, y + height / 2)
-    vertices.insert(0, center)
-    
-    indices = []
-    num_verts = len(vertices)
-    for i in range(1, num_verts - 1):
-        indices.append((0, i, i + 1))
-    indices.append((0, num_verts - 1, 1))
-    
-    batch = batch_for_shader(shader, 'TRIS', {"pos": vertices}, indices=indices)
-    shader.uniform_float("color", color)
-    batch.draw(shader)
+    # Fill one preallocated block in place: center first, then the corner arcs
+    verts = np.empty((len(offsets) + 1, 2), dtype=np.float32)
+    verts[0] = (x + width / 2, y + height / 2)
+    verts[1:] = ((x + radius, y + radius) +
+                 sides * (width - 2 * radius, height - 2 * radius) +
+                 offsets * radius)
+    return verts, fan
+
+
+def append_rect(mesh, x, y, width, height):
+    """Append a filled rectangle"""
+    mesh.add(*rect_mesh(x, y, width, height))
 
 
-def draw_bracket(shader, x, y, width, height, thickness, color, is_left=True):
+def append_rounded_rect(mesh, x, y, width, height, radius=CORNER_RADIUS, segments=4):
+    """Append a filled rectangle with rounded corners"""
+    mesh.add(*rounded_rect_mesh(x, y, width, height, radius, segments))
+
+
+def append_bracket(mesh, x, y, width, height, thickness, is_left=True):
     """
-    Draw a bracket shape "[" or "]" using simple rectangles.
+    Append a bracket shape "[" or "]" built from simple rectangles.
     Uses fixed corner radius matching Blender's UI.
     
     For "[" (is_left=True): x is the inner edge, bracket extends left for thickness
     For "]" (is_left=False): x is the inner edge, bracket extends right for thickness
     """
-    if is_left:
-        # "[" bracket - vertical bar on left, arms extend right
-        bar_x = x - thickness
-        arm_w = width - thickness
-        
-        # Vertical bar
-        draw_rounded_rect(shader, bar_x, y, thickness, height, color, radius=min(CORNER_RADIUS, thickness/2))
-        
-        # Bottom arm
-        draw_rounded_rect(shader, x, y, arm_w, thickness, color, radius=min(CORNER_RADIUS, thickness/2))
-        
-        # Top arm
-        draw_rounded_rect(shader, x, y + height - thickness, arm_w, thickness, color, radius=min(CORNER_RADIUS, thickness/2))
+    radius = min(CORNER_RADIUS, thickness / 2)
+    arm_w = width - thickness
     
-    else:
-        # "]" bracket - vertical bar on right, arms extend left
-        arm_w = width - thickness
-        
-        # Vertical bar
-        draw_rounded_rect(shader, x, y, thickness, height, color, radius=min(CORNER_RADIUS, thickness/2))
-        
-        # Bottom arm
-        draw_rounded_rect(shader, x - arm_w, y, arm_w, thickness, color, radius=min(CORNER_RADIUS, thickness/2))
-        
-        # Top arm
-        draw_rounded_rect(shader, x - arm_w, y + height - thickness, arm_w, thickness, color, radius=min(CORNER_RADIUS, thickness/2))
+    # The bar extends outward from x and the arms inward:
+    # "[" has its bar on the left (-1), "]" on the right (+1)
+    direction = -1 if is_left else 1
+    
+    if radius <= 1:
+        # Square corners: the bar and arms share edges, so emit the bracket
+        # outline as one 8 vertex polygon instead of three separate quads
+        outer_x = x + direction * thickness
+        arm_end_x = x - direction * arm_w
+        verts = np.array((
+            (outer_x, y),
+            (arm_end_x, y),
+            (arm_end_x, y + thickness),
+            (x, y + thickness),
+            (x, y + height - thickness),
+            (arm_end_x, y + height - thickness),
+            (arm_end_x, y + height),
+            (outer_x, y + height),
+        ), dtype=np.float32)
+        mesh.add(verts, BRACKET_INDICES)
+        return
+    
+    bar_x = x if direction > 0 else x - thickness
+    arm_x = x - arm_w if direction > 0 else x
+    
+    # Vertical bar
+    append_rounded_rect(mesh, bar_x, y, thickness, height, radius=radius)
+    
+    # Bottom arm
+    append_rounded_rect(mesh, arm_x, y, arm_w, thickness, radius=radius)
+    
+    # Top arm
+    append_rounded_rect(mesh, arm_x, y + height - thickness, arm_w, thickness, radius=radius)
 
 
-def draw_handle(shader, x, region_height, color, settings, is_in_handle=True):
-    """Draw a complete handle with bracket and lines"""
+def build_handle_mesh(region_height, settings, is_in_handle=True):
+    """Build the handle indicator and bracket centered on x = 0"""
     line_w = settings.line_thickness
     bracket_w = settings.bracket_thickness
     bracket_h = settings.bracket_height
@@ -476,35 +688,59 @@ def draw_handle(shader, x, region_height, color, settings, is_in_handle=True):
     
     # Determine bracket position
     if settings.bracket_position == 'TOP':
-        header_bottom = region_height - HEADER_HEIGHT
-        bracket_bottom = header_bottom - bracket_h
-        line_bottom = 0
-        line_top = bracket_bottom
+        bracket_bottom = region_height - HEADER_HEIGHT - bracket_h
     else:  # BOTTOM
         bracket_bottom = 0
-        bracket_top = bracket_h
-        line_bottom = bracket_top
-        line_top = region_height - HEADER_HEIGHT
     
-    # 1. Draw small indicator in header area
+    mesh = ShapeMesh()
+    
+    # 1. Small indicator in header area
     indicator_size = max(line_w, 4)
     indicator_y = region_height - indicator_size - 2
-    draw_rect(shader, x - half_line, indicator_y, line_w, indicator_size, color)
+    append_rect(mesh, -half_line, indicator_y, line_w, indicator_size)
     
-    # 2. Draw main vertical line
-    draw_rect(shader, x - half_line, line_bottom, line_w, line_top - line_bottom, color)
+    # 2. Bracket (the main vertical line is added separately as a polyline)
+    append_bracket(mesh, 0, bracket_bottom, arm_len + bracket_w, bracket_h,
+                   bracket_w, is_left=is_in_handle)
     
-    # 3. Draw bracket
-    if is_in_handle:
-        draw_bracket(shader, x, bracket_bottom, arm_len + bracket_w, bracket_h, 
-                    bracket_w, color, is_left=True)
-    else:
-        draw_bracket(shader, x, bracket_bottom, arm_len + bracket_w, bracket_h,
-                    bracket_w, color, is_left=False)
+    return mesh.freeze()
 
 
-def draw_range_overlay(shader, in_x, out_x, region_height, color, settings):
-    """Draw the highlighted range area between brackets"""
+def get_handle_line_span(region_height, settings):
+    """Get (bottom, top) of a handle's main vertical line"""
+    if settings.bracket_position == 'TOP':
+        return 0, region_height - HEADER_HEIGHT - settings.bracket_height
+    return settings.bracket_height, region_height - HEADER_HEIGHT
+
+
+def get_handle_mesh(region_height, settings, is_in_handle=True):
+    """Get the cached local-space handle mesh, building it on first use"""
+    key = (region_height, is_in_handle,
+           settings.bracket_position, settings.bracket_height,
+           settings.bracket_arm_length, settings.bracket_thickness,
+           settings.line_thickness)
+    
+    mesh = state.handle_meshes.get(key)
+    if mesh is None:
+        # Heights and settings rarely change; drop stale entries wholesale
+        if len(state.handle_meshes) >= 16:
+            state.handle_meshes.clear()
+        mesh = build_handle_mesh(region_height, settings, is_in_handle)
+        state.handle_meshes[key] = mesh
+    return mesh
+
+
+def append_handle(geom, x, region_height, color, settings, is_in_handle=True):
+    """Append a complete handle positioned at region x"""
+    mesh = get_handle_mesh(region_height, settings, is_in_handle)
+    geom.add(mesh, color, offset_x=x)
+    
+    line_bottom, line_top = get_handle_line_span(region_height, settings)
+    geom.add_vertical_line(x, line_bottom, line_top, color)
+
+
+def append_range_overlay(geom, in_x, out_x, region_height, color, settings):
+    """Append the highlighted range area between brackets"""
     if in_x >= out_x:
         return
     
@@ -519,41 +755,78 @@ def draw_range_overlay(shader, in_x, out_x, region_height, color, settings):
     
     padding = bracket_w
     
-    draw_rounded_rect(shader,
-                      in_x + padding,
-                      bracket_bottom + padding,
-                      out_x - in_x - padding * 2,
-                      bracket_h - padding * 2,
-                      color)
+    # A single shape, so it goes straight into the batch without a ShapeMesh
+    geom.add(rounded_rect_mesh(in_x + padding,
+                               bracket_bottom + padding,
+                               out_x - in_x - padding * 2,
+                               bracket_h - padding * 2),
+             color)
+
+
+def get_shader(name):
+    """Get a builtin shader, cached after the first lookup"""
+    shader = state.shaders.get(name)
+    if shader is None:
+        shader = gpu.shader.from_builtin(name)
+        state.shaders[name] = shader
+    return shader
+
 
+LABEL_FONT_SIZE = 11
+LABEL_PADDING = 4
+LABEL_OFFSET_X = 8      # Gap between a handle and its label text
+LABEL_ROW_HEIGHT = 16   # Preview range labels sit one row below
+LABEL_TOP_GAP = 18      # Gap between a top bracket and the labels below it
+LABEL_BOTTOM_GAP = 8    # Gap between a bottom bracket and the labels above it
+LABEL_BG_COLOR = (0.0, 0.0, 0.0, 0.85)
 
-def draw_label(x, y, text):
-    """Draw a text label with background"""
-    import blf
+
+# Labels are measured with every digit replaced by a zero, so a drag that
+# only changes the frame number reuses the measurement of its digit count
+LABEL_DIGITS_TO_ZERO = str.maketrans("123456789", "000000000")
+
+
+def get_label_info(text):
+    """
+    Get (width, height, background mesh) of a label. The background is
+    built around the text origin, so it is only translated when drawn.
+    """
+    key = text.translate(LABEL_DIGITS_TO_ZERO)
+    info = state.label_cache.get(key)
+    if info is None:
+        if len(state.label_cache) >= 256:
+            # Evict the oldest entry (dicts keep insertion order)
+            state.label_cache.pop(next(iter(state.label_cache)))
+        set_font_size(LABEL_FONT_SIZE)
+        text_w, text_h = blf.dimensions(0, key)
+        bg_mesh = rect_mesh(-LABEL_PADDING, -LABEL_PADDING,
+                            text_w + LABEL_PADDING * 2, text_h + LABEL_PADDING * 2)
+        info = (text_w, text_h, bg_mesh)
+        state.label_cache[key] = info
+    return info
+
+
+def get_text_dims(text):
+    """Get (width, height) of a label text for the default font"""
+    return get_label_info(text)[:2]
+
+
+def append_label_background(geom, x, y, text):
+    """Append the background box of a text label"""
+    geom.add(get_label_info(text)[2], LABEL_BG_COLOR, x, y)
+
+
+def draw_label_texts(labels):
+    """Draw the text of (x, y, text) labels; backgrounds are part of the widget batch"""
+    if not labels:
+        return
     
     font_id = 0
-    blf.size(font_id, 11)
-    
-    text_w, text_h = blf.dimensions(font_id, text)
-    padding = 4
-    
-    shader = gpu.shader.from_builtin('UNIFORM_COLOR')
-    shader.bind()
-    
-    bg_verts = [
-        (x - padding, y - padding),
-        (x + text_w + padding, y - padding),
-        (x + text_w + padding, y + text_h + padding),
-        (x - padding, y + text_h + padding),
-    ]
-    bg_batch = batch_for_shader(shader, 'TRIS', {"pos": bg_verts},
-                                 indices=[(0, 1, 2), (0, 2, 3)])
-    shader.uniform_float("color", (0.0, 0.0, 0.0, 0.85))
-    bg_batch.draw(shader)
-    
+    set_font_size(LABEL_FONT_SIZE)
     blf.color(font_id, 1.0, 1.0, 1.0, 1.0)
-    blf.position(font_id, x, y, 0)
-    blf.draw(font_id, text)
+    for x, y, text in labels:
+        blf.position(font_id, x, y, 0)
+        blf.draw(font_id, text)
 
 
 def brighten_color(color, factor=0.15):
@@ -561,8 +834,104 @@ def brighten_color(color, factor=0.15):
     return tuple(min(1.0, c + factor) for c in color[:3]) + (min(1.0, color[3] + 0.1),)
 
 
-def draw_timeline_widgets():
-    """Main draw callback for timeline widgets"""
+# Brightening of a handle indexed by (is_dragging << 1) | is_hovered
+HANDLE_BRIGHTEN = (0.0, 0.1, 0.2, 0.2)
+
+
+def get_handle_color(color, is_dragging, is_hovered):
+    """Get a handle color brightened for its hover/drag state"""
+    factor = HANDLE_BRIGHTEN[(is_dragging << 1) | is_hovered]
+    return brighten_color(color, factor) if factor else color
+
+
+VISIBILITY_MARGIN = 100  # Handles this far outside the region are culled
+
+
+def is_range_visible(start_x, end_x, width):
+    """Check whether any part of a range's widgets can be inside the region"""
+    return not (max(start_x, end_x) < -VISIBILITY_MARGIN or
+                min(start_x, end_x) > width + VISIBILITY_MARGIN)
+
+
+def is_handle_visible(x, width):
+    """Check whether a handle's bracket can reach into the region"""
+    return -VISIBILITY_MARGIN <= x <= width + VISIBILITY_MARGIN
+
+
+def build_widget_geometry(settings, height, width, in_x, out_x, preview_in_x, preview_out_x,
+                          labels=()):
+    """Collect range overlays, handles and label backgrounds for every visible range"""
+    geom = WidgetGeometry()
+    
+    # =========================================================================
+    # Frame Range widgets
+    # =========================================================================
+    if in_x is not None and out_x is not None:
+        if is_range_visible(in_x, out_x, width):
+            
+            # Get colors with hover/drag brightness applied
+            in_color = get_handle_color(tuple(settings.in_color),
+                                        state.is_dragging_in, state.hover_in)
+            out_color = get_handle_color(tuple(settings.out_color),
+                                         state.is_dragging_out, state.hover_out)
+            range_color = tuple(settings.range_color)
+            
+            # Range overlay goes first so the handles are blended on top
+            append_range_overlay(geom, in_x, out_x, height, range_color, settings)
+            
+            # Handles, each skipped when scrolled out on its own
+            if is_handle_visible(in_x, width):
+                append_handle(geom, in_x, height, in_color, settings, is_in_handle=True)
+            if is_handle_visible(out_x, width):
+                append_handle(geom, out_x, height, out_color, settings, is_in_handle=False)
+    
+    # =========================================================================
+    # Preview Range widgets (only when preview range is active)
+    # =========================================================================
+    if preview_in_x is not None and preview_out_x is not None:
+        if is_range_visible(preview_in_x, preview_out_x, width):
+            
+            # Get preview colors with hover/drag brightness applied
+            preview_in_color = get_handle_color(tuple(settings.preview_in_color),
+                                                state.is_dragging_preview_in,
+                                                state.hover_preview_in)
+            preview_out_color = get_handle_color(tuple(settings.preview_out_color),
+                                                 state.is_dragging_preview_out,
+                                                 state.hover_preview_out)
+            preview_range_color = tuple(settings.preview_range_color)
+            
+            # Preview range overlay
+            append_range_overlay(geom, preview_in_x, preview_out_x, height,
+                                 preview_range_color, settings)
+            
+            # Preview handles
+            if is_handle_visible(preview_in_x, width):
+                append_handle(geom, preview_in_x, height, preview_in_color, settings,
+                              is_in_handle=True)
+            if is_handle_visible(preview_out_x, width):
+                append_handle(geom, preview_out_x, height, preview_out_color, settings,
+                              is_in_handle=False)
+    
+    # Label backgrounds last so they cover the handles
+    for label_x, label_y, text in labels:
+        append_label_background(geom, label_x, label_y, text)
+    
+    return geom
+
+
+def get_settings_key(settings):
+    """Tuple of every setting that affects the widget geometry and colors"""
+    return (settings.bracket_position, settings.bracket_height,
+            settings.bracket_arm_length, settings.bracket_thickness,
+            settings.line_thickness,
+            tuple(settings.in_color), tuple(settings.out_color),
+            tuple(settings.range_color),
+            tuple(settings.preview_in_color), tuple(settings.preview_out_color),
+            tuple(settings.preview_range_color))
+
+
+def draw_timeline_widgets(space_name):
+    """Main draw callback for timeline widgets, registered once per space type"""
     context = bpy.context
     
     if context is None:
@@ -575,11 +944,12 @@ def draw_timeline_widgets():
     except Exception:
         return
     
-    if not state.enabled:
-        return
+    st = state
+    reset_gpu_state_cache()
     
+    # Only the main (WINDOW) region of an editor shows the widgets
     region = context.region
-    if region is None:
+    if region is None or region.type != 'WINDOW':
         return
     
     scene = context.scene
@@ -587,145 +957,142 @@ def draw_timeline_widgets():
         return
     
     # Get settings (global or per-editor)
-    try:
-        settings = get_editor_settings(context)
-    except Exception:
-        return
+    settings = get_editor_settings(prefs, space_name)
     
     height = region.height
     width = region.width
-    margin = 100
     
-    # Setup GPU state
-    gpu.state.blend_set('ALPHA')
-    shader = gpu.shader.from_builtin('UNIFORM_COLOR')
-    shader.bind()
+    # Collapsed or too small to fit a bracket below the header; forget the
+    # handles of the last full draw so hover doesn't hit undrawn handles
+    if width < 4 or height < HEADER_HEIGHT + settings.bracket_height:
+        st.region_handle_xs.pop(region.as_pointer(), None)
+        return
     
     bracket_h = settings.bracket_height
     if settings.bracket_position == 'TOP':
-        label_y = height - HEADER_HEIGHT - bracket_h - 18
+        label_y = height - HEADER_HEIGHT - bracket_h - LABEL_TOP_GAP
     else:
-        label_y = bracket_h + 8
+        label_y = bracket_h + LABEL_BOTTOM_GAP
     
-    # =========================================================================
-    # Draw Frame Range widgets
-    # =========================================================================
-    try:
-        in_x = frame_to_region_x(context, scene.frame_start)
-        out_x = frame_to_region_x(context, scene.frame_end)
-    except Exception:
-        in_x, out_x = None, None
+    frame_start, frame_end, preview_start, preview_end = get_display_frames(scene)
     
-    if in_x is not None and out_x is not None:
-        # Check visibility
-        if not (in_x > width + margin and out_x > width + margin) and \
-           not (in_x < -margin and out_x < -margin):
-            
-            # Get colors
-            in_color_base = tuple(settings.in_color)
-            out_color_base = tuple(settings.out_color)
-            range_color = tuple(settings.range_color)
-            
-            # Apply hover/drag brightness
-            if state.is_dragging_in:
-                in_color = brighten_color(in_color_base, 0.2)
-            elif state.hover_in:
-                in_color = brighten_color(in_color_base, 0.1)
-            else:
-                in_color = in_color_base
-            
-            if state.is_dragging_out:
-                out_color = brighten_color(out_color_base, 0.2)
-            elif state.hover_out:
-                out_color = brighten_color(out_color_base, 0.1)
-            else:
-                out_color = out_color_base
-            
-            # Draw range overlay
-            draw_range_overlay(shader, in_x, out_x, height, range_color, settings)
-            
-            # Draw handles
-            draw_handle(shader, in_x, height, in_color, settings, is_in_handle=True)
-            draw_handle(shader, out_x, height, out_color, settings, is_in_handle=False)
+    view_mapping = get_view_mapping(region)
+    in_x, out_x = range_to_region_x(view_mapping, frame_start, frame_end)
     
-    # =========================================================================
-    # Draw Preview Range widgets (only when preview range is active)
-    # =========================================================================
+    preview_in_x, preview_out_x = None, None
     if scene.use_preview_range:
-        try:
-            preview_in_x = frame_to_region_x(context, scene.frame_preview_start)
-            preview_out_x = frame_to_region_x(context, scene.frame_preview_end)
-        except Exception:
-            preview_in_x, preview_out_x = None, None
-        
-        if preview_in_x is not None and preview_out_x is not None:
-            # Check visibility
-            if not (preview_in_x > width + margin and preview_out_x > width + margin) and \
-               not (preview_in_x < -margin and preview_out_x < -margin):
-                
-                # Get preview colors
-                preview_in_color_base = tuple(settings.preview_in_color)
-                preview_out_color_base = tuple(settings.preview_out_color)
-                preview_range_color = tuple(settings.preview_range_color)
-                
-                # Apply hover/drag brightness
-                if state.is_dragging_preview_in:
-                    preview_in_color = brighten_color(preview_in_color_base, 0.2)
-                elif state.hover_preview_in:
-                    preview_in_color = brighten_color(preview_in_color_base, 0.1)
-                else:
-                    preview_in_color = preview_in_color_base
-                
-                if state.is_dragging_preview_out:
-                    preview_out_color = brighten_color(preview_out_color_base, 0.2)
-                elif state.hover_preview_out:
-                    preview_out_color = brighten_color(preview_out_color_base, 0.1)
-                else:
-                    preview_out_color = preview_out_color_base
-                
-                # Draw preview range overlay
-                draw_range_overlay(shader, preview_in_x, preview_out_x, height, 
-                                  preview_range_color, settings)
-                
-                # Draw preview handles
-                draw_handle(shader, preview_in_x, height, preview_in_color, settings, 
-                           is_in_handle=True)
-                draw_handle(shader, preview_out_x, height, preview_out_color, settings, 
-                           is_in_handle=False)
-    
-    gpu.state.blend_set('NONE')
+        preview_in_x, preview_out_x = range_to_region_x(
+            view_mapping, preview_start, preview_end)
     
-    # =========================================================================
-    # Draw labels when hovering or dragging
-    # =========================================================================
+    region_key = region.as_pointer()
+    if len(st.region_handle_xs) >= 16 and region_key not in st.region_handle_xs:
+        st.region_handle_xs.clear()
+    st.region_handle_xs[region_key] = (in_x, out_x, preview_in_x, preview_out_x)
     
-    # Frame range labels
-    if in_x is not None:
-        if state.hover_in or state.is_dragging_in:
-            label_x = in_x + 8
-            draw_label(label_x, label_y, f"IN: {scene.frame_start}")
-        
-        if state.hover_out or state.is_dragging_out:
-            import blf
-            text = f"OUT: {scene.frame_end}"
-            blf.size(0, 11)
-            text_w, _ = blf.dimensions(0, text)
-            label_x = out_x - text_w - 8
-            draw_label(label_x, label_y, text)
-    
-    # Preview range labels
-    if scene.use_preview_range:
-        if state.hover_preview_in or state.is_dragging_preview_in:
-            label_x = preview_in_x + 8
-            draw_label(label_x, label_y - 16, f"PREVIEW IN: {scene.frame_preview_start}")
-        
-        if state.hover_preview_out or state.is_dragging_preview_out:
-            import blf
-            text = f"PREVIEW OUT: {scene.frame_preview_end}"
-            blf.size(0, 11)
-            text_w, _ = blf.dimensions(0, text)
-            label_x = preview_out_x - text_w - 8
-            draw_label(label_x, label_y - 16, text)
+    # Nothing to draw when every range is scrolled out of view
+    if not is_range_visible(in_x, out_x, width) and \
+       (preview_in_x is None or not is_range_visible(preview_in_x, preview_out_x, width)):
+        return
+    
+    # Labels shown while hovering or dragging, as (x, y, text)
+    labels = []
+    if st.hover_in or st.is_dragging_in:
+        labels.append((in_x + LABEL_OFFSET_X, label_y, f"IN: {frame_start}"))
+    if st.hover_out or st.is_dragging_out:
+        text = f"OUT: {frame_end}"
+        labels.append((out_x - get_text_dims(text)[0] - LABEL_OFFSET_X, label_y, text))
+    if preview_in_x is not None:
+        preview_label_y = label_y - LABEL_ROW_HEIGHT
+        if st.hover_preview_in or st.is_dragging_preview_in:
+            labels.append((preview_in_x + LABEL_OFFSET_X, preview_label_y,
+                           f"PREVIEW IN: {preview_start}"))
+        if st.hover_preview_out or st.is_dragging_preview_out:
+            text = f"PREVIEW OUT: {preview_end}"
+            labels.append((preview_out_x - get_text_dims(text)[0] - LABEL_OFFSET_X,
+                           preview_label_y, text))
+    
+    shader = get_shader('FLAT_COLOR')
+    line_shader = get_shader('POLYLINE_FLAT_COLOR')
+    
+    # Rebuild the batch only when something visible changed since this
+    # region's last redraw
+    draw_key = (height, width, in_x, out_x, preview_in_x, preview_out_x,
+                st.hover_in, st.hover_out,
+                st.is_dragging_in, st.is_dragging_out,
+                st.hover_preview_in, st.hover_preview_out,
+                st.is_dragging_preview_in, st.is_dragging_preview_out,
+                tuple(labels), get_settings_key(settings))
+    cached = st.region_batches.get(region_key)
+    if cached is not None and cached[0] == draw_key:
+        batches = cached[1]
+    else:
+        geom = build_widget_geometry(settings, height, width, in_x, out_x,
+                                     preview_in_x, preview_out_x, labels)
+        batches = geom.build_batches(shader, line_shader)
+        if cached is None and len(st.region_batches) >= 16:
+            # Regions of closed areas never come back
+            st.region_batches.clear()
+        st.region_batches[region_key] = (draw_key, batches)
+    
+    # Submit all filled shapes in one batch and all vertical lines in another
+    tri_batch, line_batch = batches
+    if tri_batch is not None or line_batch is not None:
+        set_blend('ALPHA')
+        if line_batch is not None:
+            bind_shader(line_shader)
+            line_shader.uniform_float("viewportSize", (width, height))
+            line_shader.uniform_float("lineWidth", float(settings.line_thickness))
+            line_batch.draw(line_shader)
+        if tri_batch is not None:
+            bind_shader(shader)
+            tri_batch.draw(shader)
+        set_blend('NONE')
+    
+    # Label text goes over its background from the batch
+    draw_label_texts(labels)
+
+
+# -----------------------------------------------------------------------------
+# Frame Range Change Notifications
+# -----------------------------------------------------------------------------
+
+# Scene properties whose changes invalidate cached positions and geometry
+FRAME_RANGE_PROPS = (
+    "frame_start",
+    "frame_end",
+    "frame_preview_start",
+    "frame_preview_end",
+    "use_preview_range",
+)
+
+# Owner of our message bus subscriptions
+_msgbus_owner = object()
+
+
+def on_frame_range_changed():
+    """Drop cached handle positions as soon as a frame range changes"""
+    # Batches need no invalidation, their draw key holds positions and labels
+    state.region_handle_xs.clear()
+
+
+def subscribe_frame_range():
+    """Subscribe to frame range changes (subscriptions are lost on file load)"""
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    for prop in FRAME_RANGE_PROPS:
+        bpy.msgbus.subscribe_rna(
+            key=(bpy.types.Scene, prop),
+            owner=_msgbus_owner,
+            args=(),
+            notify=on_frame_range_changed,
+        )
+
+
+@persistent
+def on_load_post(*args):
+    """Restore message bus subscriptions after a file is loaded"""
+    # Region pointers of the old file may be reused by the new one
+    on_frame_range_changed()
+    subscribe_frame_range()
 
 
 # -----------------------------------------------------------------------------
@@ -734,6 +1101,22 @@ def draw_timeline_widgets():
 
 HANDLE_HIT_THRESHOLD = 25
 
+# Scene property driven by each handle type
+HANDLE_FRAME_PROPS = {
+    "in": "frame_start",
+    "out": "frame_end",
+    "preview_in": "frame_preview_start",
+    "preview_out": "frame_preview_end",
+}
+
+# State flag set while each handle type is being dragged
+HANDLE_DRAG_FLAGS = {
+    "in": "is_dragging_in",
+    "out": "is_dragging_out",
+    "preview_in": "is_dragging_preview_in",
+    "preview_out": "is_dragging_preview_out",
+}
+
 
 def check_handle_hover(context, mouse_x):
     """
@@ -743,39 +1126,46 @@ def check_handle_hover(context, mouse_x):
     if not state.enabled:
         return None
     
-    scene = context.scene
-    handles = []  # List of (distance, handle_name)
-    
-    # Check frame range handles
-    try:
-        in_x = frame_to_region_x(context, scene.frame_start)
-        out_x = frame_to_region_x(context, scene.frame_end)
-        handles.append((abs(mouse_x - in_x), "in"))
-        handles.append((abs(mouse_x - out_x), "out"))
-    except Exception:
-        pass
+    region = context.region
+    if region is None:
+        return None
     
-    # Check preview range handles (only if active)
-    if scene.use_preview_range:
-        try:
-            preview_in_x = frame_to_region_x(context, scene.frame_preview_start)
-            preview_out_x = frame_to_region_x(context, scene.frame_preview_end)
-            handles.append((abs(mouse_x - preview_in_x), "preview_in"))
-            handles.append((abs(mouse_x - preview_out_x), "preview_out"))
-        except Exception:
-            pass
+    # Handle positions from the region's last redraw; pans, zooms and resizes
+    # redraw the region, frame range changes drop them
+    xs = state.region_handle_xs.get(region.as_pointer())
+    if xs is None:
+        scene = context.scene
+        view_mapping = get_view_mapping(region)
+        in_x, out_x = range_to_region_x(view_mapping, scene.frame_start, scene.frame_end)
+        preview_in_x, preview_out_x = None, None
+        if scene.use_preview_range:
+            preview_in_x, preview_out_x = range_to_region_x(
+                view_mapping, scene.frame_preview_start, scene.frame_preview_end)
+    else:
+        in_x, out_x, preview_in_x, preview_out_x = xs
     
-    if not handles:
-        return None
+    # Keep the closest handle within threshold (first checked wins ties)
+    closest_handle = None
+    closest_dist = HANDLE_HIT_THRESHOLD
     
-    # Find the closest handle within threshold
-    handles.sort(key=lambda x: x[0])
-    closest_dist, closest_handle = handles[0]
+    # Check frame range handles; abs() is only taken for the rare hits
+    dist = mouse_x - in_x
+    if -closest_dist < dist < closest_dist:
+        closest_dist, closest_handle = abs(dist), "in"
+    dist = mouse_x - out_x
+    if -closest_dist < dist < closest_dist:
+        closest_dist, closest_handle = abs(dist), "out"
     
-    if closest_dist < HANDLE_HIT_THRESHOLD:
-        return closest_handle
+    # Check preview range handles (only if active)
+    if preview_in_x is not None:
+        dist = mouse_x - preview_in_x
+        if -closest_dist < dist < closest_dist:
+            closest_dist, closest_handle = abs(dist), "preview_in"
+        dist = mouse_x - preview_out_x
+        if -closest_dist < dist < closest_dist:
+            closest_handle = "preview_out"
     
-    return None
+    return closest_handle
 
 
 class TIMELINE_OT_drag_io_handle(bpy.types.Operator):
@@ -799,25 +1189,20 @@ class TIMELINE_OT_drag_io_handle(bpy.types.Operator):
         
         handle = check_handle_hover(context, mouse_x)
         
-        if handle == "in":
-            self.handle_type = "in"
-            self.initial_frame = scene.frame_start
-            state.is_dragging_in = True
-        elif handle == "out":
-            self.handle_type = "out"
-            self.initial_frame = scene.frame_end
-            state.is_dragging_out = True
-        elif handle == "preview_in":
-            self.handle_type = "preview_in"
-            self.initial_frame = scene.frame_preview_start
-            state.is_dragging_preview_in = True
-        elif handle == "preview_out":
-            self.handle_type = "preview_out"
-            self.initial_frame = scene.frame_preview_end
-            state.is_dragging_preview_out = True
-        else:
+        if handle is None:
             return {'PASS_THROUGH'}
         
+        self.handle_type = handle
+        self.initial_frame = getattr(scene, HANDLE_FRAME_PROPS[handle])
+        setattr(state, HANDLE_DRAG_FLAGS[handle], True)
+        
+        # View2D is affine and the view can't be panned or zoomed while this
+        # operator consumes events, so sample the mapping once for the drag
+        self._view_mapping = get_view_mapping(context.region)
+        self._region_width = context.region.width
+        self._last_frame = self.initial_frame
+        self._last_x = mouse_x
+        
         context.window.cursor_modal_set('SCROLL_X')
         context.window_manager.modal_handler_add(self)
         context.area.tag_redraw()
@@ -828,44 +1213,52 @@ class TIMELINE_OT_drag_io_handle(bpy.types.Operator):
         scene = context.scene
         
         if event.type == 'MOUSEMOVE':
-            try:
-                new_frame = region_x_to_frame(context, event.mouse_region_x)
-            except Exception:
+            # Vertical-only moves can't change the frame
+            if event.mouse_region_x == self._last_x:
                 return {'RUNNING_MODAL'}
+            self._last_x = event.mouse_region_x
+            
+            offset, scale = self._view_mapping
+            if context.region.width == self._region_width and scale:
+                new_frame = round_frame((event.mouse_region_x - offset) / scale)
+            else:
+                # Region was resized mid-drag, the sampled mapping is stale
+                try:
+                    new_frame = region_x_to_frame(context, event.mouse_region_x)
+                except Exception:
+                    return {'RUNNING_MODAL'}
             
             if self.handle_type == "in":
                 new_frame = max(0, min(new_frame, scene.frame_end - 1))
-                scene.frame_start = new_frame
             elif self.handle_type == "out":
                 new_frame = max(scene.frame_start + 1, new_frame)
-                scene.frame_end = new_frame
             elif self.handle_type == "preview_in":
                 new_frame = max(0, min(new_frame, scene.frame_preview_end - 1))
-                scene.frame_preview_start = new_frame
             elif self.handle_type == "preview_out":
                 new_frame = max(scene.frame_preview_start + 1, new_frame)
-                scene.frame_preview_end = new_frame
             
+            # Mouse moved less than a frame: nothing to redraw
+            if new_frame == self._last_frame:
+                return {'RUNNING_MODAL'}
+            self._last_frame = new_frame
+            
+            # Only the widgets follow the mouse; the scene is updated once on
+            # release so each move doesn't fire RNA updates and depsgraph work
+            state.drag_frame = new_frame
             context.area.tag_redraw()
             return {'RUNNING_MODAL'}
         
         elif event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
+            if self._last_frame != self.initial_frame:
+                setattr(scene, HANDLE_FRAME_PROPS[self.handle_type], self._last_frame)
+            
             context.window.cursor_modal_restore()
             self._reset_drag_states()
             context.area.tag_redraw()
             return {'FINISHED'}
         
         elif event.type in {'RIGHTMOUSE', 'ESC'}:
-            # Restore original frame
-            if self.handle_type == "in":
-                scene.frame_start = self.initial_frame
-            elif self.handle_type == "out":
-                scene.frame_end = self.initial_frame
-            elif self.handle_type == "preview_in":
-                scene.frame_preview_start = self.initial_frame
-            elif self.handle_type == "preview_out":
-                scene.frame_preview_end = self.initial_frame
-            
+            # The scene was never modified, dropping the drag frame is enough
             context.window.cursor_modal_restore()
             self._reset_drag_states()
             context.area.tag_redraw()
@@ -875,6 +1268,9 @@ class TIMELINE_OT_drag_io_handle(bpy.types.Operator):
     
     def _reset_drag_states(self):
         """Reset all drag states"""
+        state.drag_frame = None
+        # Positions drawn during the drag may not match the scene
+        state.region_handle_xs.clear()
         state.is_dragging_in = False
         state.is_dragging_out = False
         state.is_dragging_preview_in = False
@@ -888,52 +1284,69 @@ class TIMELINE_OT_hover_cursor(bpy.types.Operator):
     bl_options = {'INTERNAL'}
     
     def invoke(self, context, event):
-        if not state.enabled or context.region is None:
+        st = state
+        region = context.region
+        if not st.enabled or region is None:
             return {'PASS_THROUGH'}
         
         mouse_x = event.mouse_region_x
         mouse_y = event.mouse_region_y
+        width = region.width
+        height = region.height
+        
+        # Store old states
+        old_states = (st.hover_in, st.hover_out,
+                      st.hover_preview_in, st.hover_preview_out)
         
-        if not (0 <= mouse_x <= context.region.width and
-                0 <= mouse_y <= context.region.height):
+        if not (0 <= mouse_x <= width and 0 <= mouse_y <= height):
             # Reset all hover states when outside region
-            if state.hover_in or state.hover_out or state.hover_preview_in or state.hover_preview_out:
-                state.hover_in = False
-                state.hover_out = False
-                state.hover_preview_in = False
-                state.hover_preview_out = False
+            if any(old_states):
+                st.hover_in = False
+                st.hover_out = False
+                st.hover_preview_in = False
+                st.hover_preview_out = False
                 context.window.cursor_set('DEFAULT')
                 context.area.tag_redraw()
             return {'PASS_THROUGH'}
         
         handle = check_handle_hover(context, mouse_x)
         
-        # Store old states
-        old_states = (state.hover_in, state.hover_out, 
-                      state.hover_preview_in, state.hover_preview_out)
-        
         # Update hover states
-        state.hover_in = (handle == "in")
-        state.hover_out = (handle == "out")
-        state.hover_preview_in = (handle == "preview_in")
-        state.hover_preview_out = (handle == "preview_out")
-        
-        new_states = (state.hover_in, state.hover_out,
-                      state.hover_preview_in, state.hover_preview_out)
+        new_states = (handle == "in", handle == "out",
+                      handle == "preview_in", handle == "preview_out")
+        (st.hover_in, st.hover_out,
+         st.hover_preview_in, st.hover_preview_out) = new_states
         
-        # Update cursor
-        if handle is not None:
-            context.window.cursor_set('SCROLL_X')
-        else:
-            context.window.cursor_set('DEFAULT')
+        # Blender restores the region's cursor when the mouse enters it
+        prev_x = event.mouse_prev_x - region.x
+        prev_y = event.mouse_prev_y - region.y
+        entered = not (0 <= prev_x <= width and 0 <= prev_y <= height)
         
-        # Redraw if any state changed
-        if old_states != new_states:
+        # Update cursor and redraw only when the hovered handle changed
+        changed = old_states != new_states
+        if changed or entered:
+            if handle is not None:
+                context.window.cursor_set('SCROLL_X')
+            else:
+                context.window.cursor_set('DEFAULT')
+        if changed:
             context.area.tag_redraw()
         
         return {'PASS_THROUGH'}
 
 
+# Area types hosting the widget draw handlers
+WIDGET_AREA_TYPES = frozenset({'DOPESHEET_EDITOR', 'GRAPH_EDITOR', 'NLA_EDITOR', 'SEQUENCE_EDITOR'})
+
+
+def tag_widget_areas_redraw(context):
+    """Redraw the areas that can show the widgets"""
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type in WIDGET_AREA_TYPES:
+                area.tag_redraw()
+
+
 class TIMELINE_OT_toggle_io_widgets(bpy.types.Operator):
     """Toggle the In/Out frame widgets visibility"""
     bl_idname = "timeline.toggle_io_widgets"
@@ -943,9 +1356,12 @@ class TIMELINE_OT_toggle_io_widgets(bpy.types.Operator):
     def execute(self, context):
         state.enabled = not state.enabled
         
-        for window in context.window_manager.windows:
-            for area in window.screen.areas:
-                area.tag_redraw()
+        # Disabled widgets keep no handlers, so editors don't call into Python
+        if state.enabled:
+            add_draw_handlers()
+        else:
+            remove_draw_handlers()
+        tag_widget_areas_redraw(context)
         
         self.report({'INFO'}, f"In/Out widgets {'enabled' if state.enabled else 'disabled'}")
         return {'FINISHED'}
@@ -967,18 +1383,50 @@ def draw_menu_item(self, context):
 # Registration
 # -----------------------------------------------------------------------------
 
-ANIMATION_SPACES = [
-    'SpaceDopeSheetEditor',
-    'SpaceGraphEditor',
-    'SpaceNLA',
-    'SpaceSequenceEditor',
-]
+ANIMATION_SPACES = (
+    bpy.types.SpaceDopeSheetEditor,
+    bpy.types.SpaceGraphEditor,
+    bpy.types.SpaceNLA,
+    bpy.types.SpaceSequenceEditor,
+)
+
+
+def add_draw_handlers():
+    """Install the widget draw handler in every animation editor"""
+    for space_type in ANIMATION_SPACES:
+        space_name = space_type.__name__
+        if space_name in state.draw_handlers:
+            continue
+        handler = space_type.draw_handler_add(
+            draw_timeline_widgets, (space_name,), 'WINDOW', 'POST_PIXEL'
+        )
+        state.draw_handlers[space_name] = (space_type, handler)
+
+
+def remove_draw_handlers():
+    """Remove every installed widget draw handler"""
+    for space_name, (space_type, handler) in state.draw_handlers.items():
+        try:
+            space_type.draw_handler_remove(handler, 'WINDOW')
+        except Exception:
+            pass
+    state.draw_handlers.clear()
+
 
-VIEW_MENUS = [
-    'DOPESHEET_MT_view',
-    'GRAPH_MT_view',
-    'NLA_MT_view',
-    'SEQUENCER_MT_view',
+# Built-in UI classes, registered by bl_ui before any add-on is imported
+VIEW_MENUS = (
+    bpy.types.DOPESHEET_MT_view,
+    bpy.types.GRAPH_MT_view,
+    bpy.types.NLA_MT_view,
+    bpy.types.SEQUENCER_MT_view,
+)
+
+# (keymap name, space type) of every editor that gets the handle keymaps
+KEYMAP_SPECS = [
+    ('Dopesheet', 'DOPESHEET_EDITOR'),
+    ('Graph Editor', 'GRAPH_EDITOR'),
+    ('NLA Editor', 'NLA_EDITOR'),
+    ('Sequencer', 'SEQUENCE_EDITOR'),
 ]
 
 addon_keymaps = []
@@ -996,60 +1444,33 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     
-    for space_name in ANIMATION_SPACES:
-        space_type = getattr(bpy.types, space_name, None)
-        if space_type is not None:
-            handler = space_type.draw_handler_add(
-                draw_timeline_widgets, (), 'WINDOW', 'POST_PIXEL'
-            )
-            state.draw_handlers[space_name] = (space_type, handler)
+    if state.enabled:
+        add_draw_handlers()
     
-    for menu_name in VIEW_MENUS:
-        menu_type = getattr(bpy.types, menu_name, None)
-        if menu_type is not None:
-            menu_type.append(draw_menu_item)
+    for menu_type in VIEW_MENUS:
+        menu_type.append(draw_menu_item)
+    
+    subscribe_frame_range()
+    bpy.app.handlers.load_post.append(on_load_post)
     
     wm = bpy.context.window_manager
     kc = wm.keyconfigs.addon
     if kc:
-        # Dopesheet
-        km = kc.keymaps.new(name='Dopesheet', space_type='DOPESHEET_EDITOR')
-        kmi = km.keymap_items.new(TIMELINE_OT_drag_io_handle.bl_idname,
-                                   'LEFTMOUSE', 'PRESS')
-        addon_keymaps.append((km, kmi))
-        kmi = km.keymap_items.new(TIMELINE_OT_hover_cursor.bl_idname,
-                                   'MOUSEMOVE', 'ANY')
-        addon_keymaps.append((km, kmi))
-        
-        # Graph Editor
-        km = kc.keymaps.new(name='Graph Editor', space_type='GRAPH_EDITOR')
-        kmi = km.keymap_items.new(TIMELINE_OT_drag_io_handle.bl_idname,
-                                   'LEFTMOUSE', 'PRESS')
-        addon_keymaps.append((km, kmi))
-        kmi = km.keymap_items.new(TIMELINE_OT_hover_cursor.bl_idname,
-                                   'MOUSEMOVE', 'ANY')
-        addon_keymaps.append((km, kmi))
-        
-        # NLA Editor
-        km = kc.keymaps.new(name='NLA Editor', space_type='NLA_EDITOR')
-        kmi = km.keymap_items.new(TIMELINE_OT_drag_io_handle.bl_idname,
-                                   'LEFTMOUSE', 'PRESS')
-        addon_keymaps.append((km, kmi))
-        kmi = km.keymap_items.new(TIMELINE_OT_hover_cursor.bl_idname,
-                                   'MOUSEMOVE', 'ANY')
-        addon_keymaps.append((km, kmi))
-        
-        # Sequencer
-        km = kc.keymaps.new(name='Sequencer', space_type='SEQUENCE_EDITOR')
-        kmi = km.keymap_items.new(TIMELINE_OT_drag_io_handle.bl_idname,
-                                   'LEFTMOUSE', 'PRESS')
-        addon_keymaps.append((km, kmi))
-        kmi = km.keymap_items.new(TIMELINE_OT_hover_cursor.bl_idname,
-                                   'MOUSEMOVE', 'ANY')
-        addon_keymaps.append((km, kmi))
+        for km_name, space_type in KEYMAP_SPECS:
+            km = kc.keymaps.new(name=km_name, space_type=space_type)
+            kmi = km.keymap_items.new(TIMELINE_OT_drag_io_handle.bl_idname,
+                                       'LEFTMOUSE', 'PRESS')
+            addon_keymaps.append((km, kmi))
+            kmi = km.keymap_items.new(TIMELINE_OT_hover_cursor.bl_idname,
+                                       'MOUSEMOVE', 'ANY')
+            addon_keymaps.append((km, kmi))
 
 
 def unregister():
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    bpy.msgbus.clear_by_owner(_msgbus_owner)
+    
     for km, kmi in addon_keymaps:
         try:
             km.keymap_items.remove(kmi)
@@ -1057,20 +1478,22 @@ def unregister():
             pass
     addon_keymaps.clear()
     
-    for menu_name in VIEW_MENUS:
-        menu_type = getattr(bpy.types, menu_name, None)
-        if menu_type is not None:
-            try:
-                menu_type.remove(draw_menu_item)
-            except ValueError:
-                pass
-    
-    for space_name, (space_type, handler) in state.draw_handlers.items():
+    for menu_type in VIEW_MENUS:
         try:
-            space_type.draw_handler_remove(handler, 'WINDOW')
-        except Exception:
+            menu_type.remove(draw_menu_item)
+        except ValueError:
             pass
-    state.draw_handlers.clear()
+    
+    remove_draw_handlers()
+    
+    # GPU batches, shaders and formats must not outlive the add-on
+    state.region_batches.clear()
+    state.region_handle_xs.clear()
+    state.handle_meshes.clear()
+    state.label_cache.clear()
+    state.shaders.clear()
+    state.vert_format = None
+    reset_gpu_state_cache()
     
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)